@@ -4,9 +4,11 @@
 """
 TC Premium Tile SKU Manager - single-file app for macOS (Python 3.7) and Windows
 
-- products.xlsx stores product records (Timestamp, BrandCode, BrandName, BrandID, SizeLabel, SizeCode,
+- products.db (SQLite) stores product records (Timestamp, BrandCode, BrandName, BrandID, SizeLabel, SizeCode,
   SurfaceLabel, SurfaceCode, MattPolished, SPCode, SKU, CommercialName, Faces, Batch, CountryPrefix, CompanyPrefix, EAN13, ImagePaths, Notes)
-- deleted_products.xlsx stores deleted product records (same structure)
+- deleted product records live in the same database (deleted_products table, same structure)
+- products.xlsx / deleted_products.xlsx are written on demand via the Export to Excel button
+  (legacy spreadsheets are imported into the database on first run)
 - images/<SKU>/ contains saved product images, barcode.png, qrcode.png
 - Images > 2000px resized (max dimension 2000), saved as PNG
 - SPCode auto-increments per (BrandCode + SizeCode)
@@ -21,33 +23,121 @@ TC Premium Tile SKU Manager - single-file app for macOS (Python 3.7) and Windows
 - SKU List: Scrollable Treeview with proper scrollbars and wider columns
 - Image Context Menu: Right-click on images in Preview for Copy Image (to clipboard, PNG, Windows/macOS) and Delete Image (remove from ImagePaths and file)
 - Viewer Edit: Add Images button to append images, Add Notes button to append or create Notes
+- Optional speedups: pillow-simd (AVX2 Lanczos resampling, drop-in Pillow replacement),
+  lxml (faster Excel parsing), oxipng on PATH (enables Tools > Optimize Images),
+  numexpr (fused filter queries), rapidfuzz (typo-tolerant search fallback)
 """
 
 from __future__ import print_function
 import os
 import sys
+import json
+import hashlib
 import shutil
+import sqlite3
+import subprocess
+import tempfile
 import datetime as dt
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, Toplevel
-from PIL import Image, ImageTk
-import pandas as pd
 import io
 
-# Optional packages for barcode and qrcode
-try:
-    import barcode
-    from barcode.writer import ImageWriter
-except ImportError:
-    barcode = None
+# Heavy modules (pandas alone costs hundreds of ms on a cold start) and the
+# optional barcode/qrcode packages are imported on first use so the window
+# comes up immediately.
+pd = None
+Image = None
+ImageTk = None
+barcode = None
+ImageWriter = None
+qrcode = None
+_BARCODE_TRIED = False
+_QRCODE_TRIED = False
+_LXML_CHECKED = False
+_NUMEXPR = None
+_NUMEXPR_TRIED = False
+rapidfuzz = None
+_RAPIDFUZZ_TRIED = False
+
+def _lazy_pd():
+    global pd
+    if pd is None:
+        import pandas
+        pd = pandas
+    return pd
+
+def _lazy_pil():
+    global Image, ImageTk
+    if Image is None:
+        from PIL import Image as _Image, ImageTk as _ImageTk
+        Image, ImageTk = _Image, _ImageTk
+    return Image
+
+def _lazy_barcode():
+    global barcode, ImageWriter, _BARCODE_TRIED
+    if not _BARCODE_TRIED:
+        _BARCODE_TRIED = True
+        try:
+            import barcode as _barcode
+            from barcode.writer import ImageWriter as _ImageWriter
+            barcode, ImageWriter = _barcode, _ImageWriter
+        except ImportError:
+            pass
+    return barcode
 
-try:
-    import qrcode
-except ImportError:
-    qrcode = None
+def _lazy_qrcode():
+    global qrcode, _QRCODE_TRIED
+    if not _QRCODE_TRIED:
+        _QRCODE_TRIED = True
+        try:
+            import qrcode as _qrcode
+            qrcode = _qrcode
+        except ImportError:
+            pass
+    return qrcode
+
+def _lazy_rapidfuzz():
+    global rapidfuzz, _RAPIDFUZZ_TRIED
+    if not _RAPIDFUZZ_TRIED:
+        _RAPIDFUZZ_TRIED = True
+        try:
+            import rapidfuzz as _rapidfuzz
+            rapidfuzz = _rapidfuzz
+        except ImportError:
+            pass
+    return rapidfuzz
+
+def _has_numexpr():
+    global _NUMEXPR, _NUMEXPR_TRIED
+    if not _NUMEXPR_TRIED:
+        _NUMEXPR_TRIED = True
+        try:
+            import numexpr as _numexpr
+            _NUMEXPR = _numexpr
+        except ImportError:
+            pass
+    return _NUMEXPR is not None
+
+def _warn_if_no_lxml():
+    # lxml speeds up openpyxl's XML parsing noticeably on big sheets
+    global _LXML_CHECKED
+    if _LXML_CHECKED:
+        return
+    _LXML_CHECKED = True
+    try:
+        import lxml  # noqa: F401
+    except ImportError:
+        print("Warning: lxml not installed; Excel import/export will be slower", file=sys.stderr)
+
+# openpyxl read_only mode skips the full workbook cell model (big memory/speed win)
+EXCEL_READ_KWARGS = {"engine": "openpyxl", "engine_kwargs": {"read_only": True, "data_only": True, "keep_links": False}}
 
 # ---------------- Config ----------------
-DATA_FILE = "products.xlsx"
+DB_FILE = "products.db"
+DATA_FILE = "products.xlsx"  # on-demand Excel export / legacy import
 DELETED_DATA_FILE = "deleted_products.xlsx"
 IMAGES_ROOT = "images"
 LOGO_FILE = "logo.png"  # small logo (optional)
@@ -92,6 +182,16 @@ MATT_POLISHED_OPTIONS = {
     "Polished": "1"
 }
 
+# Inverse maps (code -> label) and filter combobox values, built once instead
+# of scanning the forward dicts on every selection/build
+MP_INVERSE = {v: k for k, v in MATT_POLISHED_OPTIONS.items()}
+SURFACE_INVERSE = {v: k for k, v in SURFACE_OPTIONS.items()}
+SIZE_INVERSE = {v: k for k, v in SIZES.items()}
+BRAND_FILTER_VALUES = [""] + BRAND_CODES
+SURFACE_FILTER_VALUES = [""] + list(SURFACE_OPTIONS)
+MP_FILTER_VALUES = [""] + list(MATT_POLISHED_OPTIONS)
+SIZE_FILTER_VALUES = [""] + list(SIZES)
+
 # Stone types (20)
 STONE_TYPES = [
     "Marble", "Granite", "Quartz", "Porcelain", "Ceramic",
@@ -131,59 +231,206 @@ COLUMNS = [
     "ImagePaths", "Notes"
 ]
 
+# SQLite connection (products table mirrors COLUMNS)
+_CONN = None
+
+def get_conn():
+    global _CONN
+    if _CONN is None:
+        fresh_db = not os.path.isfile(DB_FILE)
+        _CONN = sqlite3.connect(DB_FILE, isolation_level=None)
+        cols_sql = ", ".join('"{}" TEXT'.format(c) for c in COLUMNS)
+        had_deleted = _CONN.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='deleted_products'").fetchone() is not None
+        _CONN.execute("CREATE TABLE IF NOT EXISTS products ({})".format(cols_sql))
+        _CONN.execute("CREATE UNIQUE INDEX IF NOT EXISTS ux_products_sku ON products(SKU)")
+        _CONN.execute("CREATE INDEX IF NOT EXISTS ix_products_brand_size ON products(BrandCode, SizeCode)")
+        _CONN.execute("CREATE TABLE IF NOT EXISTS deleted_products ({})".format(cols_sql))
+        _CONN.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        if fresh_db or _meta_flag(_CONN, "products_import_pending"):
+            _run_legacy_import(_CONN, DATA_FILE, "products", "products_import_pending")
+        if not had_deleted or _meta_flag(_CONN, "deleted_import_pending"):
+            # dbs created before the deleted_products table still have the
+            # old spreadsheet as the archive; pull it in once
+            _run_legacy_import(_CONN, DELETED_DATA_FILE, "deleted_products", "deleted_import_pending")
+    return _CONN
+
+def _meta_flag(conn, key):
+    row = conn.execute("SELECT value FROM meta WHERE key=?", (key,)).fetchone()
+    return row is not None and row[0] == "1"
+
+def _run_legacy_import(conn, path, table, pending_key):
+    # A locked workbook or network hiccup must not leave the fresh db silently
+    # shadowing the user's spreadsheet: flag the failure and retry next launch
+    if _import_legacy_excel(conn, path, table):
+        conn.execute("DELETE FROM meta WHERE key=?", (pending_key,))
+    else:
+        conn.execute("INSERT OR REPLACE INTO meta VALUES (?, '1')", (pending_key,))
+        print("Warning: could not read {} for import into {}; will retry on next launch".format(path, table),
+              file=sys.stderr)
+
+def _import_legacy_excel(conn, path, table):
+    # One-time migration: pull rows from a pre-SQLite spreadsheet into the db.
+    # Returns False when the spreadsheet exists but could not be read.
+    if not os.path.isfile(path):
+        return True
+    pd = _lazy_pd()
+    _warn_if_no_lxml()
+    try:
+        df = pd.read_excel(path, dtype=str, **EXCEL_READ_KWARGS)
+    except Exception:
+        return False
+    for c in COLUMNS:
+        if c not in df.columns:
+            df[c] = ""
+    rows = [tuple("" if pd.isna(v) else str(v) for v in row) for row in df[COLUMNS].itertuples(index=False, name=None)]
+    if rows:
+        placeholders = ",".join("?" * len(COLUMNS))
+        conn.executemany("INSERT OR IGNORE INTO {} VALUES ({})".format(table, placeholders), rows)
+    return True
+
 # Ensure storage
 def ensure_storage():
     if not os.path.isdir(IMAGES_ROOT):
         os.makedirs(IMAGES_ROOT, exist_ok=True)
-    if not os.path.isfile(DATA_FILE):
-        df = pd.DataFrame(columns=COLUMNS)
-        df.to_excel(DATA_FILE, index=False)
-    if not os.path.isfile(DELETED_DATA_FILE):
-        df = pd.DataFrame(columns=COLUMNS)
-        df.to_excel(DELETED_DATA_FILE, index=False)
+    get_conn()
+
+# Load & save DataFrame (cached per file mtime so the UI hot path
+# doesn't re-read the store on every callback). sku_pos maps SKU -> row
+# position so per-click lookups skip the full-column scan; filter_cols holds
+# the pre-cast filter arrays (kept here rather than in df.attrs, which pandas
+# propagates and compares through every derived frame).
+_DF_CACHE = {"mtime": None, "df": None, "sku_pos": None, "filter_cols": None}
+_DELETED_DF_CACHE = {"mtime": None, "df": None}
+
+def _file_mtime_ns(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
 
-# Load & save DataFrame
 def load_df():
     ensure_storage()
+    pd = _lazy_pd()
+    mtime = _file_mtime_ns(DB_FILE)
+    if mtime is not None and _DF_CACHE["mtime"] == mtime:
+        # shallow copy: copy-on-write keeps caller mutations out of the cache
+        # without duplicating every column buffer per call
+        return _DF_CACHE["df"].copy(deep=False)
     try:
-        df = pd.read_excel(DATA_FILE, dtype=str)
+        df = pd.read_sql_query("SELECT * FROM products", get_conn())
     except Exception:
         df = pd.DataFrame(columns=COLUMNS)
-    for c in COLUMNS:
-        if c not in df.columns:
-            df[c] = ""
-    if "SPCode" in df.columns:
-        df["SPCode"] = df["SPCode"].fillna("").apply(lambda x: str(x).zfill(3) if str(x).strip().isdigit() else x)
-    return df
+    # normalize shape and fill once so callbacks can index without per-cell
+    # .get fallbacks
+    df = df.reindex(columns=COLUMNS).fillna("")
+    sp = df["SPCode"].astype(str)
+    df["SPCode"] = sp.str.zfill(3).where(sp.str.strip().str.isdigit(), sp)
+    _DF_CACHE["mtime"] = mtime
+    _DF_CACHE["df"] = df
+    _DF_CACHE["sku_pos"] = None
+    # pre-cast filter columns once per load; _apply_filters reuses them on
+    # every keystroke instead of re-allocating astype/lower copies
+    _DF_CACHE["filter_cols"] = {
+        "brand_str": df["BrandCode"].astype(str).to_numpy(),
+        "size_str": df["SizeLabel"].astype(str).to_numpy(),
+        "mp_str": df["MattPolished"].astype(str).to_numpy(),
+        "surface_lower": df["SurfaceLabel"].astype(str).str.lower(),
+    }
+    return df.copy(deep=False)
 
 def load_deleted_df():
     ensure_storage()
+    pd = _lazy_pd()
+    mtime = _file_mtime_ns(DB_FILE)
+    if mtime is not None and _DELETED_DF_CACHE["mtime"] == mtime:
+        return _DELETED_DF_CACHE["df"].copy(deep=False)
     try:
-        df = pd.read_excel(DELETED_DATA_FILE, dtype=str)
+        df = pd.read_sql_query("SELECT * FROM deleted_products", get_conn())
     except Exception:
         df = pd.DataFrame(columns=COLUMNS)
-    for c in COLUMNS:
-        if c not in df.columns:
-            df[c] = ""
-    return df
-
-def save_df(df):
-    df.to_excel(DATA_FILE, index=False)
-
-def save_deleted_df(df):
-    df.to_excel(DELETED_DATA_FILE, index=False)
+    df = df.reindex(columns=COLUMNS).fillna("")
+    _DELETED_DF_CACHE["mtime"] = mtime
+    _DELETED_DF_CACHE["df"] = df
+    return df.copy(deep=False)
+
+def _invalidate_df_cache():
+    _DF_CACHE["mtime"] = None
+    _DF_CACHE["df"] = None
+    _DF_CACHE["sku_pos"] = None
+    _DF_CACHE["filter_cols"] = None
+
+def get_product_row(sku):
+    """Return the product row for sku as a Series, or None if unknown."""
+    df = load_df()
+    pos = _DF_CACHE["sku_pos"]
+    if pos is None:
+        pos = {str(s): i for i, s in enumerate(df["SKU"].values)}
+        _DF_CACHE["sku_pos"] = pos
+    i = pos.get(str(sku))
+    return None if i is None else df.iloc[i]
+
+def insert_product(row):
+    # Single O(1) append for the save path; row is a dict keyed by COLUMNS
+    placeholders = ",".join("?" * len(COLUMNS))
+    get_conn().execute("INSERT INTO products VALUES ({})".format(placeholders), tuple(str(row.get(c, "")) for c in COLUMNS))
+    _invalidate_df_cache()
+
+def archive_product(row):
+    """Move one product row into deleted_products atomically."""
+    conn = get_conn()
+    placeholders = ",".join("?" * len(COLUMNS))
+    conn.execute("BEGIN")
+    try:
+        conn.execute("INSERT INTO deleted_products VALUES ({})".format(placeholders), tuple(str(row[c]) for c in COLUMNS))
+        conn.execute("DELETE FROM products WHERE SKU=?", (str(row["SKU"]),))
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    _invalidate_df_cache()
+    _DELETED_DF_CACHE["mtime"] = None
+    _DELETED_DF_CACHE["df"] = None
+
+def _write_excel_rows(columns, rows, path):
+    # write_only mode streams rows instead of building a Cell object per value,
+    # which is where df.to_excel spends most of its time
+    import openpyxl
+    _warn_if_no_lxml()
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Sheet1")
+    ws.append(list(columns))
+    for row in rows:
+        ws.append(row)
+    wb.save(path)
+
+def _write_excel(df, path):
+    pd = _lazy_pd()
+    _write_excel_rows(df.columns, (["" if pd.isna(v) else v for v in row] for row in df.itertuples(index=False, name=None)), path)
+
+def export_to_excel():
+    _write_excel(load_df(), DATA_FILE)
+    _write_excel(load_deleted_df(), DELETED_DATA_FILE)
+    return DATA_FILE
 
 # EAN-13 utils
+# Weight tables indexed by ord(ch)-48 so the checksum loop needs no int()
+# conversions or intermediate digit lists
+_EAN_ODD = tuple(range(10))
+_EAN_EVEN = tuple(i * 3 for i in range(10))
+
 def ean13_checkdigit(base12):
-    digits = [int(d) for d in base12]
-    odd_sum = sum(digits[0::2])
-    even_sum = sum(digits[1::2]) * 3
-    total = odd_sum + even_sum
-    check = (10 - (total % 10)) % 10
-    return str(check)
+    total = 0
+    for i, ch in enumerate(base12):
+        total += _EAN_EVEN[ord(ch) - 48] if i & 1 else _EAN_ODD[ord(ch) - 48]
+    return str((10 - total % 10) % 10)
+
+# Deletion table for str.translate: strips every non-digit in C instead of
+# filtering char-by-char in Python
+_NONDIGIT = dict.fromkeys(i for i in range(256) if not chr(i).isdigit())
 
 def build_ean13(country_prefix, company_prefix, brand_id, spcode):
-    base = "".join(ch for ch in (str(country_prefix) + str(company_prefix) + str(brand_id) + str(int(spcode)).zfill(3)) if ch.isdigit())
+    base = (str(country_prefix) + str(company_prefix) + str(brand_id) + str(int(spcode)).zfill(3)).translate(_NONDIGIT)
     if len(base) < 12:
         base12 = base.rjust(12, "0")
     else:
@@ -200,22 +447,35 @@ def build_full_spcode(brand_code, size_code, matt_polished, spcode):
 
 # Resize & save image
 def resize_and_save(src, dst_base):
+    Image = _lazy_pil()
     try:
         with Image.open(src) as im:
             w, h = im.size
             if max(w, h) > MAX_DIM:
+                if im.format == "JPEG":
+                    # let libjpeg decode at 1/2, 1/4 or 1/8 scale before the
+                    # final Lanczos pass
+                    im.draft("RGB", (MAX_DIM, MAX_DIM))
+                    w, h = im.size
                 scale = MAX_DIM / float(max(w, h))
                 nw = int(round(w * scale))
                 nh = int(round(h * scale))
                 im = im.resize((nw, nh), Image.LANCZOS)
                 dst = dst_base + ".png"
-                im.save(dst, format="PNG", optimize=True)
+                # optimize=True re-runs zlib several times for a marginal size
+                # win; keep interactive saves fast and leave squeezing files to
+                # the Tools > Optimize Images action
+                im.save(dst, format="PNG", compress_level=6)
                 return dst
             else:
                 ext = os.path.splitext(src)[1].lower()
                 dst = dst_base + ext
                 shutil.copy2(src, dst)
                 return dst
+    except FileNotFoundError:
+        # callers pass paths straight from the file dialog without stat'ing
+        # them first; a vanished source just yields no saved image
+        return None
     except Exception:
         try:
             ext = os.path.splitext(src)[1].lower()
@@ -225,102 +485,224 @@ def resize_and_save(src, dst_base):
         except Exception:
             return None
 
+# (st_size, st_mtime_ns) -> destination saved earlier this session; picking
+# the same source file again reuses the finished output instead of paying
+# decode + Lanczos again
+_IMAGE_SIG_CACHE = {}
+
+def resize_or_reuse(src, dst_base):
+    try:
+        st = os.stat(src)
+    except OSError:
+        return resize_and_save(src, dst_base)
+    sig = (os.path.abspath(src), st.st_size, st.st_mtime_ns)
+    cached = _IMAGE_SIG_CACHE.get(sig)
+    if cached and os.path.isfile(cached):
+        dst = dst_base + os.path.splitext(cached)[1]
+        try:
+            shutil.copy2(cached, dst)
+            return dst
+        except Exception:
+            pass
+    dst = resize_and_save(src, dst_base)
+    if dst:
+        _IMAGE_SIG_CACHE[sig] = dst
+    return dst
+
+# Decoded-thumbnail cache. Keyed on mtime so edits on disk invalidate; raw
+# bytes are cached (not PhotoImage) since Tk objects are tied to the widget
+# tree. Results also persist as small PNGs under images/.thumb_cache so later
+# sessions skip the full-size decode entirely.
+THUMB_CACHE_DIR = os.path.join(IMAGES_ROOT, ".thumb_cache")
+
+def _thumb_cache_path(path, mtime_ns, w, h):
+    key = hashlib.sha1("{}|{}|{}x{}".format(path, mtime_ns, w, h).encode("utf-8")).hexdigest()
+    return os.path.join(THUMB_CACHE_DIR, key + ".png")
+
+@lru_cache(maxsize=64)
+def _cached_thumb(path, mtime_ns, w, h):
+    Image = _lazy_pil()
+    cache_file = _thumb_cache_path(path, mtime_ns, w, h)
+    try:
+        with Image.open(cache_file) as im:
+            im.load()
+            return im.tobytes(), im.size, im.mode
+    except Exception:
+        pass  # missing or unreadable cache entry; decode the original
+    with Image.open(path) as im:
+        im.draft("RGB", (w, h))  # JPEG-only fast path; no-op elsewhere
+        im.thumbnail((w, h), Image.LANCZOS)
+        if im.mode not in ("RGB", "RGBA"):
+            im = im.convert("RGBA" if "A" in im.mode or "transparency" in im.info else "RGB")
+        try:
+            os.makedirs(THUMB_CACHE_DIR, exist_ok=True)
+            im.save(cache_file, format="PNG")
+        except Exception:
+            pass
+        return im.tobytes(), im.size, im.mode
+
+def load_thumb(path, w, h):
+    Image = _lazy_pil()
+    raw, size, mode = _cached_thumb(path, os.stat(path).st_mtime_ns, w, h)
+    return Image.frombytes(mode, size, raw)
+
 # Copy image to clipboard
+def _png_bytes(img):
+    # PNG handles RGB/RGBA natively; only convert other modes
+    if img.mode not in ("RGB", "RGBA"):
+        img = img.convert("RGB")
+    output = io.BytesIO()
+    img.save(output, format="PNG")
+    return output.getvalue()
+
+def _copy_clipboard_windows(img, root):
+    try:
+        import win32clipboard
+    except ImportError:
+        # Tk marshals large byte strings through Tcl very slowly; only use
+        # it when pywin32 is unavailable
+        root.clipboard_clear()
+        root.clipboard_append(_png_bytes(img), type="image/png")
+        return
+    output = io.BytesIO()
+    img.convert("RGB").save(output, format="BMP")
+    bmp_data = output.getvalue()[14:]  # Skip BMP file header, keep the DIB
+    win32clipboard.OpenClipboard()
+    try:
+        win32clipboard.EmptyClipboard()
+        win32clipboard.SetClipboardData(win32clipboard.CF_DIB, bmp_data)
+    finally:
+        win32clipboard.CloseClipboard()
+
+def _copy_clipboard_macos(img):
+    fd, tmp = tempfile.mkstemp(suffix=".png")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_png_bytes(img))
+        subprocess.run(
+            ["osascript", "-e",
+             'set the clipboard to (read (POSIX file "{}") as «class PNGf»)'.format(tmp)],
+            check=True)
+    finally:
+        os.unlink(tmp)
+
 def copy_image_to_clipboard(img_path, root):
+    Image = _lazy_pil()
     try:
         with Image.open(img_path) as img:
-            output = io.BytesIO()
-            img.convert("RGB").save(output, format="PNG")
-            data = output.getvalue()
-            output.close()
-            root.clipboard_clear()
             if sys.platform == "win32":
-                from tkinter import TclError
-                try:
-                    root.clipboard_append(data, type="image/png")
-                except TclError:
-                    # Fallback for Windows
-                    import win32clipboard
-                    output = BytesIO()
-                    img.convert("RGB").save(output, format="BMP")
-                    bmp_data = output.getvalue()[14:]  # Skip BMP header
-                    output.close()
-                    win32clipboard.OpenClipboard()
-                    win32clipboard.EmptyClipboard()
-                    win32clipboard.SetClipboardData(win32clipboard.CF_DIB, bmp_data)
-                    win32clipboard.CloseClipboard()
+                _copy_clipboard_windows(img, root)
+            elif sys.platform == "darwin":
+                _copy_clipboard_macos(img)
             else:
-                # macOS and Linux (requires Tk 8.6+)
-                root.clipboard_append(data, type="image/png")
+                # Linux (requires Tk 8.6+)
+                root.clipboard_clear()
+                root.clipboard_append(_png_bytes(img), type="image/png")
         messagebox.showinfo("Success", "Image copied to clipboard")
     except Exception as e:
         messagebox.showerror("Error", f"Failed to copy image: {str(e)}")
 
+# ImagePaths is stored as a JSON array; records written before that change
+# used a semicolon-joined string, so reads fall back to splitting on ";"
+def _parse_image_paths(val):
+    s = str(val or "").strip()
+    if not s:
+        return []
+    if s.startswith("["):
+        try:
+            return json.loads(s)
+        except ValueError:
+            pass
+    return s.split(";")
+
+def _dump_image_paths(paths):
+    return json.dumps(list(paths), ensure_ascii=False)
+
 # Delete image from product
 def delete_image_from_product(sku, img_path):
-    df = load_df()
-    row = df[df["SKU"].astype(str) == sku]
-    if row.empty:
+    ensure_storage()
+    row = get_conn().execute("SELECT ImagePaths FROM products WHERE SKU=?", (str(sku),)).fetchone()
+    if row is None:
         return False
-    row = row.iloc[0]
-    images = str(row.get("ImagePaths","")).split(";") if row.get("ImagePaths","") else []
-    if img_path in images:
-        images.remove(img_path)
-        try:
-            os.remove(img_path)
-        except Exception:
-            pass
-        df.loc[df["SKU"] == sku, "ImagePaths"] = ";".join(images)
-        save_df(df)
-        return True
-    return False
+    images = _parse_image_paths(row[0])
+    if img_path not in images:
+        return False
+    images.remove(img_path)
+    try:
+        os.remove(img_path)
+    except Exception:
+        pass
+    get_conn().execute("UPDATE products SET ImagePaths=? WHERE SKU=?", (_dump_image_paths(images), str(sku)))
+    _invalidate_df_cache()
+    return True
+
+# Barcode and QR generation. The rendered PNGs are pure functions of the
+# EAN digits / SPCode, so the expensive font+draw pipeline is memoized and
+# repeat saves just rewrite cached bytes.
+@lru_cache(maxsize=512)
+def _render_barcode_png(ean13_str):
+    if _lazy_barcode() is None:
+        return None
+    num = str(ean13_str)
+    if len(num) != 13 or not num.isdigit():
+        return None
+    EAN = barcode.get_barcode_class('ean13')
+    buf = io.BytesIO()
+    EAN(num, writer=ImageWriter()).write(buf)
+    return buf.getvalue()
+
+# Shared QR engine; cleared and refilled per render instead of rebuilding
+# the module tables each time
+_QR = None
+
+@lru_cache(maxsize=512)
+def _render_qr_png(spcode):
+    global _QR
+    if _lazy_qrcode() is None:
+        return None
+    if _QR is None:
+        _QR = qrcode.QRCode(box_size=6, border=2, error_correction=qrcode.constants.ERROR_CORRECT_L)
+    qr_url = "https://thangcuongtiles.com/{}".format(spcode)
+    _QR.clear()
+    _QR.version = None  # let make(fit=True) pick the smallest version again
+    _QR.add_data(qr_url)
+    _QR.make(fit=True)
+    img = _QR.make_image(fill_color="black", back_color="white")
+    buf = io.BytesIO()
+    img.save(buf)
+    return buf.getvalue()
 
-# Barcode and QR generation
 def generate_barcode_qr(ean13_str, sku_folder, spcode):
     bc_path = None
     qr_path = None
     try:
-        if barcode is not None:
-            writer = ImageWriter()
-            EAN = barcode.get_barcode_class('ean13')
-            num = str(ean13_str)
-            if len(num) == 13 and num.isdigit():
-                bc_obj = EAN(num, writer=writer)
-                bc_fname = os.path.join(sku_folder, "{}_barcode".format(spcode))
-                bc_obj.save(bc_fname)
-                if os.path.isfile(bc_fname + ".png"):
-                    bc_path = bc_fname + ".png"
+        data = _render_barcode_png(str(ean13_str))
+        if data:
+            bc_path = os.path.join(sku_folder, "{}_barcode.png".format(spcode))
+            with open(bc_path, "wb") as f:
+                f.write(data)
     except Exception:
         bc_path = None
     try:
-        if qrcode is not None:
-            qr_url = "https://thangcuongtiles.com/{}".format(spcode)
-            qr = qrcode.QRCode(box_size=6, border=2)
-            qr.add_data(qr_url)
-            qr.make(fit=True)
-            img = qr.make_image(fill_color="black", back_color="white")
+        data = _render_qr_png(str(spcode))
+        if data:
             qr_path = os.path.join(sku_folder, "{}_qrcode.png".format(spcode))
-            img.save(qr_path)
+            with open(qr_path, "wb") as f:
+                f.write(data)
     except Exception:
         qr_path = None
     return bc_path, qr_path
 
 # Auto SPCode generation
 def next_spcode_for(brand_code, size_code):
-    df = load_df()
-    if df.empty:
-        return "001"
-    sel = df[(df["BrandCode"] == brand_code) & (df["SizeCode"] == size_code)]
-    if sel.empty:
-        return "001"
-    try:
-        nums = sel["SPCode"].apply(lambda x: int(str(x).strip()) if str(x).strip().isdigit() else 0)
-        nxt = int(nums.max()) + 1
-        if nxt < 1:
-            nxt = 1
-        return str(nxt).zfill(3)
-    except Exception:
-        return "001"
+    ensure_storage()
+    row = get_conn().execute(
+        "SELECT MAX(CAST(SPCode AS INTEGER)) FROM products WHERE BrandCode=? AND SizeCode=?",
+        (brand_code, size_code)).fetchone()
+    nxt = int(row[0] or 0) + 1
+    if nxt < 1:
+        nxt = 1
+    return str(nxt).zfill(3)
 
 # Open folder helper
 def open_folder(path):
@@ -450,6 +832,7 @@ class EntryTab(ttk.Frame):
         top.pack(fill="x", padx=pad, pady=pad)
         if os.path.isfile(LOGO_FILE):
             try:
+                _lazy_pil()
                 img = Image.open(LOGO_FILE)
                 img.thumbnail((40, 40))
                 self.logo_photo = ImageTk.PhotoImage(img)
@@ -582,9 +965,19 @@ class EntryTab(ttk.Frame):
                 self.selected_images.append(f)
                 self.img_listbox.insert("end", os.path.basename(f))
         self.status_var.set("Selected {} images".format(len(self.selected_images)))
+        # decode ahead of time off-thread so clicking through the listbox
+        # hits the thumbnail cache
+        threading.Thread(target=self._warm_thumb_cache, args=(list(files),), daemon=True).start()
         if self.selected_images:
             self.show_preview(self.selected_images[0])
 
+    def _warm_thumb_cache(self, paths):
+        for p in paths:
+            try:
+                load_thumb(p, 900, 700)
+            except Exception:
+                pass
+
     def clear_images(self):
         self.selected_images = []
         self.img_listbox.delete(0, "end")
@@ -601,9 +994,8 @@ class EntryTab(ttk.Frame):
 
     def show_preview(self, path):
         try:
-            im = Image.open(path)
-            im.thumbnail((900, 700))
-            self._thumb = ImageTk.PhotoImage(im)
+            _lazy_pil()
+            self._thumb = ImageTk.PhotoImage(load_thumb(path, 900, 700))
             self.preview_label.config(image=self._thumb, text="")
         except Exception as e:
             self.preview_label.config(text="Preview error: {}".format(e))
@@ -678,36 +1070,48 @@ class EntryTab(ttk.Frame):
         if err:
             messagebox.showerror("Validation", err)
             return
-        df = load_df()
+        ensure_storage()
         sku = build_sku(data["brand_code"], data["size_code"], data["matt_polished"], data["spcode"])
         ean13 = build_ean13(data["country"], data["company"], data["brand_id"], data["spcode"])
 
-        if sku in df["SKU"].astype(str).values:
+        # O(1) lookup through the unique SKU index
+        if get_conn().execute("SELECT 1 FROM products WHERE SKU=?", (sku,)).fetchone():
             messagebox.showerror("Duplicate", "SKU exists: {}".format(sku))
             return
 
         sku_dir = os.path.join(IMAGES_ROOT, sku)
         os.makedirs(sku_dir, exist_ok=True)
-        saved_paths = []
         face_count = data["faces"]
-        idx = 1
+        jobs = []
         for i, src in enumerate(self.selected_images, start=1):
-            if not os.path.isfile(src):
-                continue
             face_idx = ((i - 1) % face_count) + 1
-            base = os.path.join(sku_dir, "{}_face{:02d}_{:02d}".format(data["spcode"], face_idx, idx))
-            dst = resize_and_save(src, base)
-            if dst:
-                saved_paths.append(dst)
-            idx += 1
+            base = os.path.join(sku_dir, "{}_face{:02d}_{:02d}".format(data["spcode"], face_idx, i))
+            jobs.append((src, base))
+
+        # Resize and render codes off the Tk thread; PIL releases the GIL
+        # around decode/resize so the pool scales with cores
+        self.save_button.config(state="disabled")
+        self.status_var.set("Saving SKU {}...".format(sku))
+        threading.Thread(target=self._save_worker, args=(data, sku, ean13, sku_dir, jobs), daemon=True).start()
 
+    def _save_worker(self, data, sku, ean13, sku_dir, jobs):
+        saved_paths = []
+        if jobs:
+            with ThreadPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as ex:
+                for dst in ex.map(lambda job: resize_or_reuse(job[0], job[1]), jobs):
+                    if dst:
+                        saved_paths.append(dst)
         bc, qr = generate_barcode_qr(ean13, sku_dir, data["spcode"])
         if bc:
             saved_paths.append(bc)
         if qr:
             saved_paths.append(qr)
+        # DB insert and widget updates belong on the Tk thread
+        self.after(0, self._finish_save, data, sku, ean13, saved_paths)
 
-        image_paths_str = ";".join(saved_paths)
+    def _finish_save(self, data, sku, ean13, saved_paths):
+        self.save_button.config(state="normal")
+        image_paths_str = _dump_image_paths(saved_paths)
 
         new_row = {
             "Timestamp": dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
@@ -731,8 +1135,12 @@ class EntryTab(ttk.Frame):
             "Notes": data["notes"]
         }
 
-        df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
-        save_df(df)
+        try:
+            insert_product(new_row)
+        except sqlite3.IntegrityError:
+            # another writer inserted the same SKU while images were saving
+            messagebox.showerror("Duplicate", "SKU exists: {}".format(sku))
+            return
         self.status_var.set(f"Saved SKU: {sku}")
         messagebox.showinfo("Saved", f"Saved SKU: {sku}\nEAN-13: {ean13}")
         if callable(self.viewer_refresh):
@@ -748,6 +1156,17 @@ class ViewerTab(ttk.Frame):
         super().__init__(master)
         self._thumbs = []
         self._image_paths = []
+        self._search_blob = None
+        self._search_blob_mtime = None
+        self._pending_rows = []
+        self._populated = 0
+        # preview decodes run here; bumping _select_gen abandons results from
+        # a selection the user has already moved past
+        self._pool = ThreadPoolExecutor(max_workers=4)
+        self._select_gen = 0
+        self._refresh_after = None
+        self._refreshing = False
+        self._adding_images = False
         self._build_ui()
         self.refresh()
 
@@ -762,44 +1181,43 @@ class ViewerTab(ttk.Frame):
 
         ttk.Label(top, text="Brand").grid(row=0, column=3, padx=6)
         self.brand_filter = tk.StringVar(value="")
-        ttk.Combobox(top, textvariable=self.brand_filter, values=[""] + BRAND_CODES, state="readonly", width=6).grid(row=0, column=4)
+        ttk.Combobox(top, textvariable=self.brand_filter, values=BRAND_FILTER_VALUES, state="readonly", width=6).grid(row=0, column=4)
 
         ttk.Label(top, text="Surface").grid(row=0, column=5, padx=6)
         self.surface_filter = tk.StringVar(value="")
-        ttk.Combobox(top, textvariable=self.surface_filter, values=[""] + list(SURFACE_OPTIONS.keys()), state="readonly", width=15).grid(row=0, column=6)
+        ttk.Combobox(top, textvariable=self.surface_filter, values=SURFACE_FILTER_VALUES, state="readonly", width=15).grid(row=0, column=6)
 
         ttk.Label(top, text="Matt/Polished").grid(row=0, column=7, padx=6)
         self.mp_filter = tk.StringVar(value="")
-        ttk.Combobox(top, textvariable=self.mp_filter, values=[""] + list(MATT_POLISHED_OPTIONS.keys()), state="readonly", width=10).grid(row=0, column=8)
+        ttk.Combobox(top, textvariable=self.mp_filter, values=MP_FILTER_VALUES, state="readonly", width=10).grid(row=0, column=8)
 
         ttk.Label(top, text="Size").grid(row=0, column=9, padx=6)
         self.size_filter = tk.StringVar(value="")
-        ttk.Combobox(top, textvariable=self.size_filter, values=[""] + list(SIZES.keys()), state="readonly", width=10).grid(row=0, column=10)
+        ttk.Combobox(top, textvariable=self.size_filter, values=SIZE_FILTER_VALUES, state="readonly", width=10).grid(row=0, column=10)
+
+        # refresh as the user types/toggles, debounced so a burst of
+        # keystrokes filters once
+        for var in (self.q_var, self.brand_filter, self.surface_filter, self.mp_filter, self.size_filter):
+            var.trace_add("write", self._schedule_refresh)
 
         mid = ttk.PanedWindow(self, orient="horizontal")
         mid.pack(fill="both", expand=True, padx=pad, pady=pad)
         left = ttk.Frame(mid); mid.add(left, weight=3)
         right = ttk.Frame(mid); mid.add(right, weight=3)
 
-        # SKU List with proper scrollbars
+        # SKU List with proper scrollbars. Rows are inserted in pages as the
+        # user scrolls (see _extend_tree) so refresh cost tracks the visible
+        # window, not the whole filtered catalog.
         left_frame = ttk.Frame(left)
         left_frame.pack(fill="both", expand=True)
-        left_canvas = tk.Canvas(left_frame)
-        scrollbar_y = ttk.Scrollbar(left_frame, orient="vertical", command=left_canvas.yview)
-        scrollbar_x = ttk.Scrollbar(left_frame, orient="horizontal", command=left_canvas.xview)
-        scrollable_left = ttk.Frame(left_canvas)
-        scrollable_left.bind(
-            "<Configure>",
-            lambda e: left_canvas.configure(scrollregion=left_canvas.bbox("all"))
-        )
-        left_canvas.create_window((0, 0), window=scrollable_left, anchor="nw")
-        left_canvas.configure(yscrollcommand=scrollbar_y.set, xscrollcommand=scrollbar_x.set)
+        cols = ["SKU", "CommercialName", "BrandCode", "SizeLabel", "SurfaceLabel", "MattPolished", "SPCode", "Faces", "Batch", "EAN13", "Timestamp"]
+        self.tree = ttk.Treeview(left_frame, columns=cols, show="headings")
+        scrollbar_y = ttk.Scrollbar(left_frame, orient="vertical", command=self.tree.yview)
+        scrollbar_x = ttk.Scrollbar(left_frame, orient="horizontal", command=self.tree.xview)
+        self._tree_scrollbar_y = scrollbar_y
+        self.tree.configure(yscrollcommand=self._on_tree_yscroll, xscrollcommand=scrollbar_x.set)
         scrollbar_y.pack(side="right", fill="y")
         scrollbar_x.pack(side="bottom", fill="x")
-        left_canvas.pack(side="left", fill="both", expand=True)
-
-        cols = ["SKU", "CommercialName", "BrandCode", "SizeLabel", "SurfaceLabel", "MattPolished", "SPCode", "Faces", "Batch", "EAN13", "Timestamp"]
-        self.tree = ttk.Treeview(scrollable_left, columns=cols, show="headings")
         self.tree.column("SKU", width=150)
         self.tree.column("CommercialName", width=300)
         self.tree.column("BrandCode", width=80)
@@ -813,7 +1231,7 @@ class ViewerTab(ttk.Frame):
         self.tree.column("Timestamp", width=120)
         for c in cols:
             self.tree.heading(c, text=c)
-        self.tree.pack(fill="both", expand=True)
+        self.tree.pack(side="left", fill="both", expand=True)
         self.tree.bind("<<TreeviewSelect>>", self.on_select)
         self.tree.bind("<Double-1>", self.open_folder)
 
@@ -834,6 +1252,26 @@ class ViewerTab(ttk.Frame):
         canvas.pack(side="left", fill="both", expand=True)
         self.preview_frame = scrollable_frame
 
+        # Persistent preview widgets: on_select reconfigures these instead of
+        # destroying and rebuilding the whole subtree per click
+        self.lbl_name = ttk.Label(self.preview_frame, text="", font=("Helvetica", 20))
+        self.lbl_name.pack(anchor="center", pady=10)
+        self.lbl_spcode = ttk.Label(self.preview_frame, text="", font=("Helvetica", 14))
+        self.lbl_spcode.pack(anchor="center", pady=5)
+        self.lbl_surface = ttk.Label(self.preview_frame, text="", font=("Helvetica", 12))
+        self.lbl_surface.pack(anchor="center", pady=5)
+        self.lbl_mp = ttk.Label(self.preview_frame, text="", font=("Helvetica", 12))
+        self.lbl_mp.pack(anchor="center", pady=5)
+        self.lbl_notes = ttk.Label(self.preview_frame, text="", font=("Helvetica", 12), wraplength=400)
+        self.lbl_notes.pack(anchor="center", pady=5)
+        self.img_frame = ttk.Frame(self.preview_frame)
+        self.img_frame.pack(fill="x", padx=10, pady=10)
+        self.lbl_no_images = ttk.Label(self.img_frame, text="No images")
+        self.code_frame = ttk.Frame(self.preview_frame)
+        self.code_frame.pack(fill="x", pady=10)
+        self.img_slots = []  # grows on demand, recycled across selections
+        self.code_slots = [self._make_image_slot(self.code_frame), self._make_image_slot(self.code_frame)]
+
         # Action buttons
         btns = ttk.Frame(right)
         btns.pack(fill="x", pady=4)
@@ -841,74 +1279,189 @@ class ViewerTab(ttk.Frame):
         ttk.Button(btns, text="Add Notes", command=self.add_notes).pack(side="left", padx=4)
         ttk.Button(btns, text="Delete", command=self.delete_product).pack(side="left", padx=4)
         ttk.Button(btns, text="Open folder", command=self.open_folder).pack(side="left", padx=4)
+        ttk.Button(btns, text="Export to Excel", command=self.export_excel).pack(side="right", padx=4)
+
+    def _get_search_blob(self, df):
+        # One lowercased concatenated-row Series per catalog state; rebuilt
+        # only when the store changes, so per-keystroke search is a single
+        # vectorized contains pass instead of a per-row lambda
+        if df.empty:
+            # agg(axis=1) on an empty frame yields a DataFrame, not a Series
+            return _lazy_pd().Series([], dtype=str)
+        mtime = _file_mtime_ns(DB_FILE)
+        if (self._search_blob is None or self._search_blob_mtime != mtime
+                or len(self._search_blob) != len(df)):
+            self._search_blob = df.astype(str).agg(" ".join, axis=1).str.lower()
+            self._search_blob_mtime = mtime
+        return self._search_blob
 
     def _apply_filters(self, df):
+        import numpy as np
         q = str(self.q_var.get()).strip().lower()
         brand = str(self.brand_filter.get()).strip()
         surf = str(self.surface_filter.get()).strip()
         mp = str(self.mp_filter.get()).strip()
         size = str(self.size_filter.get()).strip()
+        blob = self._get_search_blob(df) if q else None
+        # fuse the equality filters into a single query pass when numexpr is
+        # available; the substring filters then only scan the shrunken frame
+        preds = []
+        local_dict = {}
         if brand:
-            df = df[df["BrandCode"].astype(str) == brand]
-        if surf:
-            df = df[df["SurfaceLabel"].str.contains(surf, case=False, na=False)]
+            preds.append("BrandCode == @brand")
+            local_dict["brand"] = brand
         if mp:
-            df = df[df["MattPolished"] == MATT_POLISHED_OPTIONS[mp]]
+            preds.append("MattPolished == @mp")
+            local_dict["mp"] = MATT_POLISHED_OPTIONS[mp]
         if size:
-            df = df[df["SizeLabel"].astype(str) == size]
+            preds.append("SizeLabel == @size")
+            local_dict["size"] = size
+        fused = bool(preds) and _has_numexpr()
+        if fused:
+            df = df.query(" and ".join(preds), engine="numexpr", local_dict=local_dict)
+        # remaining filters as boolean masks, ANDed once, indexed once; the
+        # pre-cast columns only align with the full cached frame
+        masks = []
+        fc = _DF_CACHE["filter_cols"] or {}
+
+        def _precast(name):
+            arr = fc.get(name)
+            return arr if arr is not None and len(arr) == len(df) else None
+
+        if not fused:
+            if brand:
+                arr = _precast("brand_str")
+                masks.append((arr if arr is not None else df["BrandCode"].astype(str).to_numpy()) == brand)
+            if mp:
+                arr = _precast("mp_str")
+                masks.append((arr if arr is not None else df["MattPolished"].astype(str).to_numpy()) == MATT_POLISHED_OPTIONS[mp])
+            if size:
+                arr = _precast("size_str")
+                masks.append((arr if arr is not None else df["SizeLabel"].astype(str).to_numpy()) == size)
+        if surf:
+            low = None if fused else _precast("surface_lower")
+            if low is None:
+                low = df["SurfaceLabel"].astype(str).str.lower()
+            masks.append(low.str.contains(surf.lower(), regex=False, na=False).to_numpy())
         if q:
-            df = df[df.apply(lambda r: q in " ".join([str(x).lower() for x in r.values]), axis=1)]
+            sel = blob.loc[df.index] if fused else blob
+            qmask = sel.str.contains(q, regex=False, na=False).to_numpy()
+            # few exact hits: widen with typo-tolerant matches when rapidfuzz
+            # (SIMD Levenshtein) is installed
+            if qmask.sum() < self.FUZZY_FALLBACK_HITS and _lazy_rapidfuzz() is not None:
+                matches = rapidfuzz.process.extract(
+                    q, sel.unique(), scorer=rapidfuzz.fuzz.partial_ratio,
+                    score_cutoff=75, limit=200)
+                if matches:
+                    qmask = qmask | sel.isin({m[0] for m in matches}).to_numpy()
+            masks.append(qmask)
+        if masks:
+            df = df[np.logical_and.reduce(masks)]
         return df
 
+    # Number of rows inserted per page while scrolling
+    TREE_PAGE = 200
+    # Below this many substring hits the search falls back to fuzzy matching
+    FUZZY_FALLBACK_HITS = 20
+
+    def _schedule_refresh(self, *_args):
+        if self._refresh_after is not None:
+            self.after_cancel(self._refresh_after)
+        self._refresh_after = self.after(150, self._run_scheduled_refresh)
+
+    def _run_scheduled_refresh(self):
+        self._refresh_after = None
+        self.refresh()
+
     def refresh(self, select_sku=None):
         df = load_df()
         df = self._apply_filters(df)
-        for r in self.tree.get_children():
-            self.tree.delete(r)
-        for _, row in df.iterrows():
-            vals = [
-                row.get("SKU",""), row.get("CommercialName",""), row.get("BrandCode",""), row.get("SizeLabel",""),
-                row.get("SurfaceLabel",""), row.get("MattPolished",""), row.get("SPCode",""), row.get("Faces",""),
-                row.get("Batch",""), row.get("EAN13",""), row.get("Timestamp","")
-            ]
-            self.tree.insert("", "end", iid=row.get("SKU",""), values=vals)
-        if select_sku and select_sku in self.tree.get_children():
-            self.tree.selection_set(select_sku)
-            self.tree.see(select_sku)
+        # raw tuples via numpy instead of iterrows (which materializes a
+        # Series and does a hashed lookup per cell)
+        cols = ["SKU", "CommercialName", "BrandCode", "SizeLabel", "SurfaceLabel",
+                "MattPolished", "SPCode", "Faces", "Batch", "EAN13", "Timestamp"]
+        arr = df[cols].to_numpy()
+        skus = df["SKU"].astype(str).to_numpy()
+        self._pending_rows = [(sku, tuple(vals)) for sku, vals in zip(skus, arr)]
+        # hold off scroll-driven paging while the tree is rebuilt, in case Tk
+        # delivers a scroll callback mid-clear with a stale _populated
+        self._refreshing = True
+        try:
+            self.tree.delete(*self.tree.get_children())
+            self._populated = 0
+            self._extend_tree()
+        finally:
+            self._refreshing = False
+        if select_sku:
+            # page in until the target row exists, then select it
+            while self._populated < len(self._pending_rows) and not self.tree.exists(select_sku):
+                self._extend_tree()
+            if self.tree.exists(select_sku):
+                self.tree.selection_set(select_sku)
+                self.tree.see(select_sku)
+
+    def _extend_tree(self):
+        end = min(self._populated + self.TREE_PAGE, len(self._pending_rows))
+        for sku, vals in self._pending_rows[self._populated:end]:
+            self.tree.insert("", "end", iid=sku, values=vals)
+        self._populated = end
+
+    def _on_tree_yscroll(self, first, last):
+        self._tree_scrollbar_y.set(first, last)
+        # nearing the bottom of what's inserted: page in the next slice
+        if not self._refreshing and float(last) > 0.9 and self._populated < len(self._pending_rows):
+            self._extend_tree()
 
     def add_images(self):
         sel = self.tree.selection()
         if not sel:
             messagebox.showinfo("Info", "Select a product to add images.")
             return
+        if self._adding_images:
+            messagebox.showinfo("Info", "Still adding images; wait for the previous batch to finish.")
+            return
         sku = sel[0]
-        df = load_df()
-        row = df[df["SKU"].astype(str) == sku]
-        if row.empty:
+        row = get_product_row(sku)
+        if row is None:
             messagebox.showerror("Error", "Product not found.")
             return
-        row = row.iloc[0]
         files = filedialog.askopenfilenames(title="Select images", filetypes=(("Images", "*.jpg *.jpeg *.png *.bmp *.webp"), ("All files", "*.*")))
         if not files:
             return
         sku_dir = os.path.join(IMAGES_ROOT, sku)
         os.makedirs(sku_dir, exist_ok=True)
-        saved_paths = str(row.get("ImagePaths","")).split(";") if row.get("ImagePaths","") else []
-        face_count = int(row.get("Faces", 1))
-        spcode = row.get("SPCode", "001")
+        saved_paths = _parse_image_paths(row["ImagePaths"])
+        face_count = int(row["Faces"] or 1)
+        spcode = row["SPCode"] or "001"
         idx = len([p for p in saved_paths if "_face" in p]) + 1
+        jobs = []
         for i, src in enumerate(files, start=idx):
-            if not os.path.isfile(src):
-                continue
             face_idx = ((i - 1) % face_count) + 1
             base = os.path.join(sku_dir, "{}_face{:02d}_{:02d}".format(spcode, face_idx, i))
-            dst = resize_and_save(src, base)
-            if dst and dst not in saved_paths:
+            jobs.append((src, base))
+        # same off-thread fan-out as the Entry save path: resize in parallel,
+        # then update the row and UI back on the Tk thread
+        self._adding_images = True
+        threading.Thread(target=self._add_images_worker, args=(sku, saved_paths, jobs, len(files)), daemon=True).start()
+
+    def _add_images_worker(self, sku, saved_paths, jobs, n_files):
+        results = []
+        if jobs:
+            with ThreadPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as ex:
+                results = list(ex.map(lambda job: resize_or_reuse(job[0], job[1]), jobs))
+        self.after(0, self._finish_add_images, sku, saved_paths, results, n_files)
+
+    def _finish_add_images(self, sku, saved_paths, results, n_files):
+        self._adding_images = False
+        seen = set(saved_paths)
+        for dst in results:
+            if dst and dst not in seen:
                 saved_paths.append(dst)
-        df.loc[df["SKU"] == sku, "ImagePaths"] = ";".join(saved_paths)
-        save_df(df)
+                seen.add(dst)
+        get_conn().execute("UPDATE products SET ImagePaths=? WHERE SKU=?", (_dump_image_paths(saved_paths), sku))
+        _invalidate_df_cache()
         self.refresh(select_sku=sku)
-        messagebox.showinfo("Success", f"Added {len(files)} images to SKU {sku}")
+        messagebox.showinfo("Success", f"Added {n_files} images to SKU {sku}")
 
     def add_notes(self):
         sel = self.tree.selection()
@@ -916,18 +1469,16 @@ class ViewerTab(ttk.Frame):
             messagebox.showinfo("Info", "Select a product to add notes.")
             return
         sku = sel[0]
-        df = load_df()
-        row = df[df["SKU"].astype(str) == sku]
-        if row.empty:
+        row = get_product_row(sku)
+        if row is None:
             messagebox.showerror("Error", "Product not found.")
             return
-        row = row.iloc[0]
-        current_notes = row.get("Notes", "")
+        current_notes = row["Notes"]
         dialog = AddNotesDialog(self, current_notes)
         self.wait_window(dialog)
         if dialog.result is not None:
-            df.loc[df["SKU"] == sku, "Notes"] = dialog.result
-            save_df(df)
+            get_conn().execute("UPDATE products SET Notes=? WHERE SKU=?", (dialog.result, sku))
+            _invalidate_df_cache()
             self.refresh(select_sku=sku)
             messagebox.showinfo("Success", f"Added note to SKU {sku}")
 
@@ -936,107 +1487,104 @@ class ViewerTab(ttk.Frame):
         if not sel:
             return
         sku = sel[0]
-        df = load_df()
-        row = df[df["SKU"].astype(str) == sku]
-        if row.empty:
+        row = get_product_row(sku)
+        if row is None:
             return
-        row = row.iloc[0]
-        images = str(row.get("ImagePaths","")).split(";") if row.get("ImagePaths","") else []
-        faces = int(row.get("Faces") or 1)
-        for w in self.preview_frame.winfo_children():
-            w.destroy()
+        _lazy_pil()
+        images = _parse_image_paths(row["ImagePaths"])
+        faces = int(row["Faces"] or 1)
         self._thumbs = []
         self._image_paths = []
+        gen = self._select_gen = self._select_gen + 1
+
+        # one directory listing instead of a stat per image/barcode/QR
+        sku_dir = os.path.join(IMAGES_ROOT, sku)
+        try:
+            present = {e.name for e in os.scandir(sku_dir)}
+        except OSError:
+            present = set()
 
-        # Commercial Name (large font)
-        commercial_name = row.get("CommercialName", "No Name")
-        ttk.Label(self.preview_frame, text=commercial_name, font=("Helvetica", 20)).pack(anchor="center", pady=10)
+        def _have(path):
+            if os.path.dirname(path) == sku_dir:
+                return os.path.basename(path) in present
+            return os.path.isfile(path)  # legacy rows may point elsewhere
 
-        # Full SPCode (smaller font)
+        self.lbl_name.configure(text=row["CommercialName"] or "No Name")
         full_spcode = build_full_spcode(
-            row.get("BrandCode", ""),
-            row.get("SizeCode", ""),
-            row.get("MattPolished", ""),
-            row.get("SPCode", "")
+            row["BrandCode"], row["SizeCode"], row["MattPolished"], row["SPCode"]
         )
-        ttk.Label(self.preview_frame, text=f"SPCode: {full_spcode}", font=("Helvetica", 14)).pack(anchor="center", pady=5)
-
-        # Surface Label
-        surface_label = row.get("SurfaceLabel", "")
-        ttk.Label(self.preview_frame, text=f"Surface: {surface_label or 'None'}", font=("Helvetica", 12)).pack(anchor="center", pady=5)
-
-        # Matt/Polished
-        mp_label = next((k for k, v in MATT_POLISHED_OPTIONS.items() if v == row.get("MattPolished", "")), "Unknown")
-        ttk.Label(self.preview_frame, text=f"Matt/Polished: {mp_label}", font=("Helvetica", 12)).pack(anchor="center", pady=5)
-
-        # Notes
-        notes = row.get("Notes", "")
-        ttk.Label(self.preview_frame, text=f"Notes: {notes or 'None'}", font=("Helvetica", 12), wraplength=400).pack(anchor="center", pady=5)
-
-        # Images in vertical stack with right-click menu
-        img_frame = ttk.Frame(self.preview_frame)
-        img_frame.pack(fill="x", padx=10, pady=10)
-        if not images:
-            ttk.Label(img_frame, text="No images").pack(expand=True)
-        else:
+        self.lbl_spcode.configure(text=f"SPCode: {full_spcode}")
+        self.lbl_surface.configure(text=f"Surface: {row['SurfaceLabel'] or 'None'}")
+        self.lbl_mp.configure(text=f"Matt/Polished: {MP_INVERSE.get(row['MattPolished'], 'Unknown')}")
+        self.lbl_notes.configure(text=f"Notes: {row['Notes'] or 'None'}")
+
+        # Images in vertical stack with right-click menu. Slots are persistent
+        # labels that get reconfigured; decodes happen on the pool and land
+        # back on the Tk thread via after(0, ...), so selection never blocks
+        # on PIL.
+        wanted = []
+        if images:
             show_count = min(faces, max(1, len(images)))
-            for i in range(show_count):
-                p = images[i] if i < len(images) else images[0]
-                if os.path.isfile(p):
-                    try:
-                        img = Image.open(p)
-                        img.thumbnail((300, 300))
-                        photo = ImageTk.PhotoImage(img)
-                        self._thumbs.append(photo)
-                        self._image_paths.append(p)
-                        lbl = ttk.Label(img_frame, image=photo)
-                        lbl.pack(pady=8)
-                        # Right-click menu
-                        menu = tk.Menu(self, tearoff=0)
-                        menu.add_command(label="Copy Image", command=lambda path=p: copy_image_to_clipboard(path, self.winfo_toplevel()))
-                        menu.add_command(label="Delete Image", command=lambda path=p, s=sku: self.delete_image(path, s))
-                        lbl.bind("<Button-3>", lambda e, m=menu: m.post(e.x_root, e.y_root))
-                    except Exception:
-                        ttk.Label(img_frame, text="Image Error").pack(pady=8)
-                else:
-                    ttk.Label(img_frame, text="No file").pack(pady=8)
-
-        # Barcode and QR code with right-click menu
-        code_frame = ttk.Frame(self.preview_frame)
-        code_frame.pack(fill="x", pady=10)
-        sku_dir = os.path.join(IMAGES_ROOT, sku)
-        bc = os.path.join(sku_dir, f"{row.get('SPCode','')}_barcode.png")
-        qr = os.path.join(sku_dir, f"{row.get('SPCode','')}_qrcode.png")
-        if os.path.isfile(bc):
-            try:
-                img = Image.open(bc)
-                img.thumbnail((300, 80))
-                p = ImageTk.PhotoImage(img)
-                self._thumbs.append(p)
-                self._image_paths.append(bc)
-                lbl = ttk.Label(code_frame, image=p)
-                lbl.pack(side="left", padx=10)
-                menu = tk.Menu(self, tearoff=0)
-                menu.add_command(label="Copy Image", command=lambda path=bc: copy_image_to_clipboard(path, self.winfo_toplevel()))
-                menu.add_command(label="Delete Image", command=lambda path=bc, s=sku: self.delete_image(path, s))
-                lbl.bind("<Button-3>", lambda e, m=menu: m.post(e.x_root, e.y_root))
-            except Exception:
-                pass
-        if os.path.isfile(qr):
-            try:
-                img = Image.open(qr)
-                img.thumbnail((120, 120))
-                q = ImageTk.PhotoImage(img)
-                self._thumbs.append(q)
-                self._image_paths.append(qr)
-                lbl = ttk.Label(code_frame, image=q)
-                lbl.pack(side="left", padx=10)
-                menu = tk.Menu(self, tearoff=0)
-                menu.add_command(label="Copy Image", command=lambda path=qr: copy_image_to_clipboard(path, self.winfo_toplevel()))
-                menu.add_command(label="Delete Image", command=lambda path=qr, s=sku: self.delete_image(path, s))
-                lbl.bind("<Button-3>", lambda e, m=menu: m.post(e.x_root, e.y_root))
-            except Exception:
-                pass
+            wanted = [images[i] if i < len(images) else images[0] for i in range(show_count)]
+        if wanted:
+            self.lbl_no_images.pack_forget()
+        else:
+            self.lbl_no_images.pack(expand=True)
+        while len(self.img_slots) < len(wanted):
+            self.img_slots.append(self._make_image_slot(self.img_frame))
+        for slot, p in zip(self.img_slots, wanted):
+            slot._path = p
+            slot._sku = sku
+            if _have(p):
+                slot.configure(image="", text="Loading...")
+                slot.pack(pady=8)
+                self._queue_thumb(p, 300, 300, slot, gen)
+            else:
+                slot.configure(image="", text="No file")
+                slot.pack(pady=8)
+        for slot in self.img_slots[len(wanted):]:
+            slot.pack_forget()
+
+        # Barcode and QR code slots
+        bc = os.path.join(sku_dir, f"{row['SPCode']}_barcode.png")
+        qr = os.path.join(sku_dir, f"{row['SPCode']}_qrcode.png")
+        for slot, (path, w, h) in zip(self.code_slots, ((bc, 300, 80), (qr, 120, 120))):
+            slot._path = path
+            slot._sku = sku
+            if _have(path):
+                slot.configure(image="", text="Loading...")
+                slot.pack(side="left", padx=10)
+                self._queue_thumb(path, w, h, slot, gen)
+            else:
+                slot.pack_forget()
+
+    def _make_image_slot(self, parent):
+        # the context menu reads the slot's current path/sku, so one menu and
+        # one binding serve every selection
+        lbl = ttk.Label(parent, text="")
+        lbl._path = None
+        lbl._sku = None
+        menu = tk.Menu(self, tearoff=0)
+        menu.add_command(label="Copy Image", command=lambda: copy_image_to_clipboard(lbl._path, self.winfo_toplevel()))
+        menu.add_command(label="Delete Image", command=lambda: self.delete_image(lbl._path, lbl._sku))
+        lbl.bind("<Button-3>", lambda e: menu.post(e.x_root, e.y_root))
+        return lbl
+
+    def _queue_thumb(self, path, w, h, lbl, gen):
+        fut = self._pool.submit(load_thumb, path, w, h)
+        fut.add_done_callback(lambda f: self.after(0, self._install_thumb, f, lbl, path, gen))
+
+    def _install_thumb(self, fut, lbl, path, gen):
+        if gen != self._select_gen:
+            return  # user already selected something else; widgets are gone
+        try:
+            photo = ImageTk.PhotoImage(fut.result())
+        except Exception:
+            lbl.configure(text="Image Error")
+            return
+        self._thumbs.append(photo)
+        self._image_paths.append(path)
+        lbl.configure(image=photo, text="")
 
     def delete_image(self, img_path, sku):
         if not messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete this image?"):
@@ -1055,19 +1603,20 @@ class ViewerTab(ttk.Frame):
         sku = sel[0]
         if not messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete SKU {sku}?"):
             return
-        df = load_df()
-        row = df[df["SKU"].astype(str) == sku]
-        if row.empty:
+        row = get_product_row(sku)
+        if row is None:
             messagebox.showerror("Error", "Product not found.")
             return
-        row = row.iloc[0]
-        deleted_df = load_deleted_df()
-        deleted_df = pd.concat([deleted_df, pd.DataFrame([row])], ignore_index=True)
-        save_deleted_df(deleted_df)
-        df = df[df["SKU"] != sku]
-        save_df(df)
+        archive_product(row)
         self.refresh()
-        messagebox.showinfo("Deleted", f"SKU {sku} deleted and moved to deleted_products.xlsx")
+        messagebox.showinfo("Deleted", f"SKU {sku} deleted and moved to the deleted products archive")
+
+    def export_excel(self):
+        try:
+            path = export_to_excel()
+            messagebox.showinfo("Exported", f"Exported products to {path} and deleted products to {DELETED_DATA_FILE}")
+        except Exception as e:
+            messagebox.showerror("Export error", str(e))
 
     def open_folder(self, event=None):
         sel = self.tree.selection()
@@ -1088,6 +1637,11 @@ class App(tk.Tk):
         self.title("TC Premium Tile SKU Manager")
         self.geometry("1400x800")
         ensure_storage()
+        menubar = tk.Menu(self)
+        tools = tk.Menu(menubar, tearoff=0)
+        tools.add_command(label="Optimize Images", command=self.optimize_images)
+        menubar.add_cascade(label="Tools", menu=tools)
+        self.config(menu=menubar)
         self.notebook = ttk.Notebook(self)
         self.viewer = ViewerTab(self.notebook)
         self.entry = EntryTab(self.notebook, viewer_refresh_callback=self.viewer.refresh)
@@ -1095,6 +1649,21 @@ class App(tk.Tk):
         self.notebook.add(self.viewer, text="Viewer")
         self.notebook.pack(fill="both", expand=True)
 
+    def optimize_images(self):
+        if shutil.which("oxipng") is None:
+            messagebox.showerror("Optimize Images", "oxipng not found on PATH; install it to recompress saved PNGs")
+            return
+        threading.Thread(target=self._optimize_worker, daemon=True).start()
+
+    def _optimize_worker(self):
+        pngs = []
+        for dirpath, dirs, files in os.walk(IMAGES_ROOT):
+            dirs[:] = [d for d in dirs if d != ".thumb_cache"]  # thumbnails aren't worth squeezing
+            pngs.extend(os.path.join(dirpath, f) for f in files if f.lower().endswith(".png"))
+        if pngs:
+            subprocess.run(["oxipng", "-q", "--preserve"] + pngs)
+        self.after(0, messagebox.showinfo, "Optimize Images", "Optimized {} PNG files".format(len(pngs)))
+
 if __name__ == "__main__":
     app = App()
     app.mainloop()